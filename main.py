@@ -1,6 +1,8 @@
 import sys
 import os
+import io
 import asyncio
+from collections import deque
 
 # Pastikan boleh import utils/* walaupun run dari GitHub Actions
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -14,8 +16,22 @@ from utils.telegram_sender import (
     send_telegram_message_html,
     send_photo_to_telegram_channel,
     send_video_to_telegram_channel,
+    close_http_client,
 )
-from utils.json_writer import save_results, load_posted_message_keys
+from utils.json_writer import (
+    save_results,
+    load_posted_message_keys,
+    append_posted_key,
+)
+
+# Berapa channel boleh di-fetch serentak guna client yang sama.
+# Kecil je supaya tak kena FLOOD_WAIT dari Telegram.
+FETCH_CONCURRENCY = 4
+
+# Berapa mesej boleh translate + download serentak kat background
+# sementara mesej semasa tengah dihantar (juga had Gemini call serentak).
+# Media dalam memory: paling banyak PREPARE_AHEAD + 1 (termasuk yang tengah dihantar).
+PREPARE_AHEAD = 3
 
 
 async def main():
@@ -27,7 +43,7 @@ async def main():
 
     # --- Dedupe: mesej yang dah pernah dipost ---
     # Kita guna message_key macam "@channel:12345"
-    posted_messages = set(load_posted_message_keys() or [])
+    posted_messages = load_posted_message_keys() or set()
     result_output = []
 
     # channels_data expected daripada google_sheet_reader:
@@ -41,112 +57,208 @@ async def main():
     # ]
     channels_data = fetch_channels_from_google_sheet(sheet_id, google_sheet_api_key)
 
-    for entry in channels_data:
-        channel_link = entry["channel_link"]
-        channel_type = entry.get("channel_type")  # e.g. "Alpha", "InfoFi", etc.
-        channel_username = extract_channel_username(channel_link)
+    # Satu TelegramClient je untuk seluruh run (fetch + download media),
+    # elak connect/handshake baru untuk setiap channel & setiap media
+    client = TelegramClient("telegram_session", telegram_api_id, telegram_api_hash)
+    await client.start()
+
+    try:
+        await _process_channels(client, channels_data, posted_messages, result_output)
+    finally:
+        await client.disconnect()
+        await close_http_client()
+
+    # Simpan semua result dalam results.jsonl (append satu line per mesej)
+    if result_output:
+        save_results(result_output)
+
+
+def _latest_posted_ids(posted_messages):
+    """
+    Dari set "@channel:12345", ambil message ID paling besar untuk setiap channel.
+    Dipakai sebagai min_id masa fetch supaya Telegram tak hantar balik
+    mesej yang dah dipost.
+    """
+    latest = {}
+    for key in posted_messages:
+        channel_username, _, msg_id = key.rpartition(":")
+        if not channel_username or not msg_id.isdigit():
+            continue
+        msg_id = int(msg_id)
+        if msg_id > latest.get(channel_username, 0):
+            latest[channel_username] = msg_id
+    return latest
+
+
+async def _fetch_all_channels(client, channels_data, latest_posted_ids):
+    """
+    Fetch latest messages untuk semua channel serentak (bounded by semaphore).
+    Return list of (entry, channel_username, messages) ikut susunan channels_data.
+    """
+    sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def _fetch(entry):
+        channel_username = extract_channel_username(entry["channel_link"])
+        async with sem:
+            try:
+                # Ambil latest messages, kalau nak lebih/kurang boleh ubah limit
+                messages = await fetch_latest_messages(
+                    client,
+                    channel_username,
+                    limit=5,
+                    min_id=latest_posted_ids.get(channel_username, 0),
+                )
+            except Exception as e:
+                print(f"❌ Error while fetching messages from {channel_username}: {e}")
+                messages = []
+        return entry, channel_username, messages
+
+    tasks = [asyncio.create_task(_fetch(entry)) for entry in channels_data]
+    return await asyncio.gather(*tasks)
+
+
+async def _prepare_message(client, msg):
+    """
+    Kerja berat sebelum post: translate (Gemini) + download media ke memory.
+    Jalan kat background sementara mesej sebelum ni tengah dihantar.
+    Return (translated, media_file) - media_file None untuk text only.
+    """
+    # translate_text_gemini guna requests (blocking), jadi run dalam thread
+    # supaya event loop boleh teruskan download / send lain
+    translated = await asyncio.to_thread(translate_text_gemini, msg.get("text") or "")
+
+    media_file = None
+    if msg.get("has_video") or msg.get("has_photo"):
+        # Download media dari channel sumber terus ke memory (tak sentuh disk)
+        media_file = io.BytesIO()
+        await client.download_media(msg["raw"], file=media_file)
+        if msg.get("has_video"):
+            media_file.name = f"video_{msg['id']}.mp4"
+        else:
+            media_file.name = f"photo_{msg['id']}.jpg"
+
+    return translated, media_file
 
-        print(f"\n📡 Processing channel: {channel_username} (Type: {channel_type})")
 
-        # Ambil latest messages, kalau nak lebih/kurang boleh ubah limit
-        messages = await fetch_latest_messages(
-            telegram_api_id,
-            telegram_api_hash,
-            channel_username,
-            limit=5,
-        )
+async def _process_channels(client, channels_data, posted_messages, result_output):
+    # Fetch semua channel serentak dulu, lepas tu baru post satu-satu
+    # (send ke bot API kena kekal serial sebab rate limit)
+    # min_id = ID terakhir yang dah dipost, jadi dedupe berlaku kat server Telegram
+    fetched = await _fetch_all_channels(
+        client,
+        channels_data,
+        _latest_posted_ids(posted_messages),
+    )
 
+    # Kumpul mesej baru ikut susunan asal (channel -> message)
+    # queued: key yang dah masuk jobs, supaya channel yang disenarai dua kali
+    # dalam sheet (Type lain / link dengan '/' hujung) tak dipost dua kali
+    jobs = []
+    queued = set()
+    for entry, channel_username, messages in fetched:
         for msg in messages:
-            text = msg.get("text") or ""
             msg_id = msg["id"]
             # Unique key untuk setiap mesej dalam setiap channel
             msg_key = f"{channel_username}:{msg_id}"
 
             # --- DEDUPE BERDASARKAN MESSAGE ID (BUKAN TEXT) ---
-            if msg_key in posted_messages:
+            if msg_key in posted_messages or msg_key in queued:
                 print(
                     f"⚠️ Skipping duplicate message ID {msg_id} "
                     f"from {channel_username} (key={msg_key})"
                 )
                 continue
 
-            # --- Translate dengan Gemini (function kau sendiri) ---
-            translated = translate_text_gemini(text)
+            queued.add(msg_key)
+            jobs.append((entry, channel_username, msg, msg_key))
 
-            try:
-                # === PRIORITY: VIDEO > PHOTO > TEXT ===
-
-                if msg.get("has_video"):
-                    # Download video dari channel sumber
-                    video_path = f"video_{msg_id}.mp4"
-                    async with TelegramClient(
-                        "telegram_session", telegram_api_id, telegram_api_hash
-                    ) as client:
-                        await client.download_media(msg["raw"], video_path)
-
-                    # Hantar ke channel kau dengan caption
-                    send_video_to_telegram_channel(
-                        video_path=video_path,
-                        translated_caption=translated,
-                        post_type=channel_type,  # [<b>Type</b>] tag dalam caption
-                    )
-
-                    # Cleanup file
-                    if os.path.exists(video_path):
-                        os.remove(video_path)
-
-                elif msg.get("has_photo"):
-                    # Download photo dari channel sumber
-                    image_path = f"photo_{msg_id}.jpg"
-                    async with TelegramClient(
-                        "telegram_session", telegram_api_id, telegram_api_hash
-                    ) as client:
-                        await client.download_media(msg["raw"], image_path)
-
-                    # Hantar photo + caption
-                    send_photo_to_telegram_channel(
-                        image_path=image_path,
-                        translated_caption=translated,
-                        post_type=channel_type,  # [<b>Type</b>] tag dalam caption
-                    )
-
-                    # Cleanup file
-                    if os.path.exists(image_path):
-                        os.remove(image_path)
-
-                else:
-                    # TEXT ONLY
-                    send_telegram_message_html(
-                        translated_text=translated,
-                        post_type=channel_type,  # [<b>Type</b>] line atas
-                    )
-
-                # Mark mesej ni dah dipost (tak kira ada text atau tidak)
-                posted_messages.add(msg_key)
-
-                # Log dalam results.json (via json_writer.save_results)
-                result_output.append(
-                    {
-                        "channel_link": channel_link,
-                        "channel_type": channel_type,
-                        "channel_username": channel_username,
-                        "original_text": text,
-                        "translated_text": translated,
-                        "date": msg.get("date"),
-                        "message_id": msg_id,
-                        "message_key": msg_key,
-                    }
+    # Pipeline: translate + download untuk beberapa mesej seterusnya jalan
+    # kat background (max PREPARE_AHEAD) sementara mesej semasa dihantar.
+    # Send tetap satu-satu ikut susunan asal.
+    pending = deque()
+    jobs_iter = iter(jobs)
+
+    def _schedule_next():
+        job = next(jobs_iter, None)
+        if job is not None:
+            pending.append((job, asyncio.create_task(_prepare_message(client, job[2]))))
+
+    for _ in range(PREPARE_AHEAD):
+        _schedule_next()
+
+    current_entry = None
+    while pending:
+        (entry, channel_username, msg, msg_key), prepare_task = pending.popleft()
+
+        channel_link = entry["channel_link"]
+        channel_type = entry.get("channel_type")  # e.g. "Alpha", "InfoFi", etc.
+
+        # Header sekali setiap channel, betul-betul atas log send dia
+        if entry is not current_entry:
+            current_entry = entry
+            print(f"\n📡 Processing channel: {channel_username} (Type: {channel_type})")
+
+        # Tunggu mesej ni siap prepare dulu baru mula yang seterusnya,
+        # supaya paling banyak PREPARE_AHEAD translate/download serentak.
+        # (asyncio.wait tak raise - error ditangkap kat bawah)
+        await asyncio.wait([prepare_task])
+        _schedule_next()
+
+        text = msg.get("text") or ""
+        msg_id = msg["id"]
+
+        try:
+            translated, media_file = await prepare_task
+
+            # === PRIORITY: VIDEO > PHOTO > TEXT ===
+
+            if msg.get("has_video"):
+                # Hantar ke channel kau dengan caption
+                await send_video_to_telegram_channel(
+                    video_path=media_file,
+                    translated_caption=translated,
+                    post_type=channel_type,  # [<b>Type</b>] tag dalam caption
                 )
 
-            except Exception as e:
-                print(
-                    f"❌ Error while processing message {msg_id} "
-                    f"from {channel_username}: {e}"
+            elif msg.get("has_photo"):
+                # Hantar photo + caption
+                await send_photo_to_telegram_channel(
+                    image_path=media_file,
+                    translated_caption=translated,
+                    post_type=channel_type,  # [<b>Type</b>] tag dalam caption
                 )
 
-    # Simpan semua result dalam results.json (append style)
-    if result_output:
-        save_results(result_output)
+            else:
+                # TEXT ONLY
+                await send_telegram_message_html(
+                    translated_text=translated,
+                    post_type=channel_type,  # [<b>Type</b>] line atas
+                )
+
+            # Mark mesej ni dah dipost (tak kira ada text atau tidak)
+            # dan terus simpan dalam posted_keys.txt
+            posted_messages.add(msg_key)
+            append_posted_key(msg_key)
+
+            # Log dalam results.jsonl (via json_writer.save_results)
+            result_output.append(
+                {
+                    "channel_link": channel_link,
+                    "channel_type": channel_type,
+                    "channel_username": channel_username,
+                    "original_text": text,
+                    "translated_text": translated,
+                    "date": msg.get("date"),
+                    "message_id": msg_id,
+                    "message_key": msg_key,
+                }
+            )
+
+        except Exception as e:
+            print(
+                f"❌ Error while processing message {msg_id} "
+                f"from {channel_username}: {e}"
+            )
 
 
 if __name__ == "__main__":
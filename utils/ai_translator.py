@@ -1,21 +1,108 @@
 import os
+import json
 import time
+import atexit
+import hashlib
+import threading
+from collections import OrderedDict
+
 import requests
+from requests.adapters import HTTPAdapter
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 GEMINI_MODEL = "gemini-2.5-flash"  # current, fast & cheap. Change to gemini-2.5-pro if you prefer.
 
+GEMINI_API_BASE = "https://generativelanguage.googleapis.com"
+
+# One keep-alive session for all translate calls, so each message after the
+# first skips the TCP + TLS handshake. Pool sized for the few translations
+# main() runs in parallel threads. Retries stay in translate_text_gemini().
+_SESSION = requests.Session()
+_SESSION.mount(GEMINI_API_BASE, HTTPAdapter(pool_connections=1, pool_maxsize=4))
+atexit.register(_SESSION.close)
+
+# -------------------- Translation cache --------------------
+# Crypto channels repost a lot of identical text ("GM", price alerts, cross-posts).
+# Successful translations are kept in an LRU keyed by a hash of (model, prompt)
+# and persisted to disk, so a repeat never costs another Gemini call,
+# even in the next GitHub Actions run (.cache is restored by actions/cache).
+
+TRANSLATION_CACHE_PATH = os.path.join(".cache", "translation_cache.jsonl")
+TRANSLATION_CACHE_SIZE = 4096
+
+_translation_cache = OrderedDict()  # key -> translated text
+_translation_cache_lock = threading.Lock()
+_translation_cache_dirty = False
+
+
+def _translation_cache_key(prompt: str, model: str) -> str:
+    return hashlib.blake2b(f"{model}\0{prompt}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _load_translation_cache(path: str = TRANSLATION_CACHE_PATH):
+    if not os.path.exists(path):
+        return
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+                _translation_cache[entry["k"]] = entry["v"]
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue
+
+    while len(_translation_cache) > TRANSLATION_CACHE_SIZE:
+        _translation_cache.popitem(last=False)
+
+
+def _save_translation_cache(path: str = TRANSLATION_CACHE_PATH):
+    if not _translation_cache_dirty:
+        return
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with _translation_cache_lock:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for k, v in _translation_cache.items():
+                f.write(json.dumps({"k": k, "v": v}, ensure_ascii=False) + "\n")
+    os.replace(tmp_path, path)
+
+
+def _cache_get(key: str) -> str | None:
+    with _translation_cache_lock:
+        value = _translation_cache.get(key)
+        if value is not None:
+            _translation_cache.move_to_end(key)
+        return value
+
+
+def _cache_put(key: str, value: str):
+    global _translation_cache_dirty
+    with _translation_cache_lock:
+        _translation_cache[key] = value
+        _translation_cache.move_to_end(key)
+        if len(_translation_cache) > TRANSLATION_CACHE_SIZE:
+            _translation_cache.popitem(last=False)
+        _translation_cache_dirty = True
+
+
+_load_translation_cache()
+atexit.register(_save_translation_cache)
+
+
 def translate_text_gemini(text: str, model: str = GEMINI_MODEL) -> str:
     """
     Translates `text` to Malay using Google Gemini API (Developer API).
     Returns translated text or "" on failure.
+    Identical text is served from the translation cache without calling Gemini.
     """
-    if not text or not isinstance(text, str) or not text.strip():
+    # isspace() answers "only whitespace?" without building a stripped copy
+    if not text or not isinstance(text, str) or text.isspace():
         print(f"[Warning] Empty or invalid text received for translation: {text}")
         return ""
 
-    url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+    url = f"{GEMINI_API_BASE}/v1beta/models/{model}:generateContent"
     headers = {
         "Content-Type": "application/json",
         "x-goog-api-key": GEMINI_API_KEY,  # <-- use header, not ?key=
@@ -38,6 +125,14 @@ def translate_text_gemini(text: str, model: str = GEMINI_MODEL) -> str:
         f"Text:\n{text}"
     )
 
+    # Keyed on the full prompt, so editing the instructions above
+    # automatically stops reusing translations made with the old ones
+    cache_key = _translation_cache_key(prompt, model)
+    cached = _cache_get(cache_key)
+    if cached is not None:
+        print(f"[Cache] Translation reused for: {text[:60]}...")
+        return cached
+
     payload = {
         "contents": [
             {
@@ -56,7 +151,7 @@ def translate_text_gemini(text: str, model: str = GEMINI_MODEL) -> str:
     backoff = 2
     for attempt in range(1, retries + 1):
         try:
-            resp = requests.post(url, headers=headers, json=payload, timeout=60)
+            resp = _SESSION.post(url, headers=headers, json=payload, timeout=60)
             # If you want to see the exact error body on non-2xx:
             if not resp.ok:
                 # Helpful debug print
@@ -78,6 +173,7 @@ def translate_text_gemini(text: str, model: str = GEMINI_MODEL) -> str:
                     t = p.get("text", "").strip()
                     if t:
                         print(f"[Success] Translation completed for: {text[:60]}...")
+                        _cache_put(cache_key, t)
                         return t
 
             print(f"[Warning] Empty translation on attempt {attempt}. Retrying...")
@@ -1,10 +1,67 @@
+import os
+import json
 import requests
 
-def fetch_channels_from_google_sheet(sheet_id, api_key):
-    url = f"https://sheets.googleapis.com/v4/spreadsheets/{sheet_id}/values/'api call'!A1:Z1000?key={api_key}"
-    response = requests.get(url)
+SHEET_RANGE = "'api call'!A1:Z1000"
+CACHE_PATH = os.path.join(".cache", "google_sheet.json")
+
+# Parsed channel list per sheet_id, so repeat calls in the same run are free
+_channels_cache = {}
+
+
+def _load_sheet_cache(cache_path):
+    if not os.path.exists(cache_path):
+        return {}
+
+    with open(cache_path, "r", encoding="utf-8") as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError:
+            return {}
+
+
+def _save_sheet_cache(cache_path, sheet_id, etag, rows):
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with open(cache_path, "w", encoding="utf-8") as f:
+        json.dump({"sheet_id": sheet_id, "etag": etag, "rows": rows}, f)
+
+
+def _fetch_sheet_rows(sheet_id, api_key, cache_path=CACHE_PATH):
+    """
+    Read the channel rows via values:batchGet (one quota unit even if more
+    ranges are added later). The last body + ETag are kept on disk so an
+    unchanged sheet comes back as 304 Not Modified with no body.
+    """
+    url = f"https://sheets.googleapis.com/v4/spreadsheets/{sheet_id}/values:batchGet"
+    params = {"ranges": SHEET_RANGE, "key": api_key}
+
+    cached = _load_sheet_cache(cache_path)
+    headers = {}
+    if cached.get("sheet_id") == sheet_id and cached.get("etag"):
+        headers["If-None-Match"] = cached["etag"]
+
+    response = requests.get(url, params=params, headers=headers, timeout=30)
+
+    if response.status_code == 304:
+        print("📄 Google Sheet not modified, using cached rows.")
+        return cached.get("rows", [])
+
     data = response.json()
-    rows = data.get("values", [])
+    value_ranges = data.get("valueRanges", [])
+    rows = value_ranges[0].get("values", []) if value_ranges else []
+
+    etag = response.headers.get("ETag")
+    if response.ok and etag:
+        _save_sheet_cache(cache_path, sheet_id, etag, rows)
+
+    return rows
+
+
+def fetch_channels_from_google_sheet(sheet_id, api_key):
+    if sheet_id in _channels_cache:
+        return _channels_cache[sheet_id]
+
+    rows = _fetch_sheet_rows(sheet_id, api_key)
 
     if not rows:
         return []
@@ -23,4 +80,5 @@ def fetch_channels_from_google_sheet(sheet_id, api_key):
                 "channel_type": row[type_idx],   # 👈 save Type too
             })
 
+    _channels_cache[sheet_id] = channel_data
     return channel_data
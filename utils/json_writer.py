@@ -1,75 +1,147 @@
-import json
 import os
 from datetime import datetime
 
-def save_results(messages, file_path="results.json"):
+import ijson
+import orjson
+
+RESULTS_PATH = "results.jsonl"
+LEGACY_RESULTS_PATH = "results.json"
+
+
+def save_results(messages, file_path=RESULTS_PATH):
     """
-    Save new messages into results.json.
-    Works whether the file already contains a dict with 'messages'
-    or a top-level list of messages.
+    Append new messages to results.jsonl (JSON Lines, one message per line).
+    Each record gets its own 'timestamp'. Only the new records are written,
+    so the cost doesn't grow with the size of the history.
     """
-    existing_messages = []
+    _migrate_legacy_results(file_path)
 
-    if os.path.exists(file_path):
-        with open(file_path, "r", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-            except json.JSONDecodeError:
-                data = {}
+    timestamp = datetime.now().isoformat()
+    with open(file_path, "ab") as f:
+        f.writelines(
+            orjson.dumps({**m, "timestamp": m.get("timestamp", timestamp)}) + b"\n"
+            for m in messages
+        )
 
-        # Handle both shapes: dict-with-'messages' and list
-        if isinstance(data, dict):
-            existing_messages = data.get("messages", [])
-        elif isinstance(data, list):
-            existing_messages = data
 
-    # Combine existing and new messages
-    combined_messages = existing_messages + messages
+def _iter_legacy_result_messages(file_path=LEGACY_RESULTS_PATH):
+    """
+    Stream message dicts out of the old results.json with ijson, one at a
+    time, instead of json.load()-ing the whole history into memory.
+    Works whether the file is a dict with 'messages' or a top-level list.
+    """
+    if not os.path.exists(file_path):
+        return
+
+    with open(file_path, "rb") as f:
+        # Peek first non-whitespace byte to know which shape we're reading
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        f.seek(0)
+
+        if first == b"{":
+            prefix = "messages.item"
+        elif first == b"[":
+            prefix = "item"
+        else:
+            return
 
-    # Save back in a consistent dict format
-    data = {"timestamp": datetime.now().isoformat(), "messages": combined_messages}
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4)
+        try:
+            for msg in ijson.items(f, prefix, use_float=True):
+                if isinstance(msg, dict):
+                    yield msg
+        except ijson.JSONError:
+            return
 
 
-def load_posted_messages(file_path="results.json"):
+def _migrate_legacy_results(file_path=RESULTS_PATH, legacy_path=LEGACY_RESULTS_PATH):
     """
-    OLD BEHAVIOUR (kept for compatibility):
-    Load all 'original_text' entries from results.json.
-    Works safely whether results.json is a dict with 'messages'
-    or a list of messages.
+    One-time migration: copy every message from the old results.json into
+    results.jsonl. Does nothing once results.jsonl exists.
+    The old results.json is left untouched as an archive.
     """
+    if os.path.exists(file_path) or not os.path.exists(legacy_path):
+        return
+
+    tmp_path = file_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        for msg in _iter_legacy_result_messages(legacy_path):
+            f.write(orjson.dumps(msg) + b"\n")
+    os.replace(tmp_path, file_path)
+
+
+def _iter_result_messages(file_path=RESULTS_PATH):
+    """
+    Yield message dicts from results.jsonl, one line at a time.
+    Blank or broken lines (e.g. a run killed mid-write) are skipped.
+    """
+    _migrate_legacy_results(file_path)
+
     if not os.path.exists(file_path):
-        return []
+        return
+
+    with open(file_path, "rb") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                msg = orjson.loads(line)
+            except orjson.JSONDecodeError:
+                continue
+            if isinstance(msg, dict):
+                yield msg
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        try:
-            data = json.load(f)
-        except json.JSONDecodeError:
-            return []
-
-    # Handle both shapes: dict-with-'messages' and list
-    if isinstance(data, dict):
-        items = data.get("messages", [])
-    elif isinstance(data, list):
-        items = data
-    else:
-        items = []
-
-    posted_messages = []
-    for msg in items:
-        if isinstance(msg, dict) and "original_text" in msg:
-            posted_messages.append(msg["original_text"])
+
+def load_posted_messages(file_path=RESULTS_PATH):
+    """
+    OLD BEHAVIOUR (kept for compatibility):
+    Load the set of all 'original_text' entries from results.jsonl.
+    """
+    posted_messages = set()
+    for msg in _iter_result_messages(file_path):
+        if "original_text" in msg:
+            posted_messages.add(msg["original_text"])
 
     return posted_messages
 
 
-def load_posted_message_keys(file_path="results.json"):
+def load_posted_message_keys(file_path="posted_keys.txt", results_path=RESULTS_PATH):
     """
-    NEW FUNCTION for this project:
-    Load list of unique 'message_key' values that have already been posted.
+    Load the set of unique 'message_key' values that have already been posted.
+
+    Keys live in a small append-only index (one key per line), written by
+    append_posted_key() right after each successful post, so startup cost
+    doesn't grow with the size of the results.jsonl archive.
 
-    Expected structure in each message (new entries from exchange_info_ai_agent.py):
+    If the index doesn't exist yet (first run after upgrading), it is
+    bootstrapped once from results.jsonl via _scan_message_keys().
+    """
+    if os.path.exists(file_path):
+        with open(file_path, "r", encoding="utf-8") as f:
+            return {line.rstrip("\n") for line in f if line.strip()}
+
+    keys = _scan_message_keys(results_path)
+    if keys:
+        with open(file_path, "w", encoding="utf-8") as f:
+            f.writelines(key + "\n" for key in keys)
+    return keys
+
+
+def append_posted_key(key, file_path="posted_keys.txt"):
+    """
+    Append one posted 'message_key' to the dedupe index.
+    """
+    with open(file_path, "a", encoding="utf-8") as f:
+        f.write(key + "\n")
+
+
+def _scan_message_keys(file_path=RESULTS_PATH):
+    """
+    Scan results.jsonl for 'message_key' values that have already been posted.
+    Only used to bootstrap the posted_keys.txt index on its first run.
+
+    Expected structure in each message (new entries from main.py):
         {
             "channel_link": "...",
             "channel_type": "...",
@@ -87,31 +159,11 @@ def load_posted_message_keys(file_path="results.json"):
         "@channel:12345".
       - Old entries without these fields are simply ignored (won't be deduped).
     """
-    if not os.path.exists(file_path):
-        return []
-
-    with open(file_path, "r", encoding="utf-8") as f:
-        try:
-            data = json.load(f)
-        except json.JSONDecodeError:
-            return []
-
-    # Handle both shapes: dict-with-'messages' and list
-    if isinstance(data, dict):
-        items = data.get("messages", [])
-    elif isinstance(data, list):
-        items = data
-    else:
-        items = []
-
-    keys = []
-    for msg in items:
-        if not isinstance(msg, dict):
-            continue
-
+    keys = set()
+    for msg in _iter_result_messages(file_path):
         # Preferred: explicit message_key
         if "message_key" in msg and isinstance(msg["message_key"], str):
-            keys.append(msg["message_key"])
+            keys.add(msg["message_key"])
             continue
 
         # Fallback: reconstruct from channel_username + message_id if available
@@ -119,6 +171,6 @@ def load_posted_message_keys(file_path="results.json"):
         message_id = msg.get("message_id")
 
         if isinstance(channel_username, str) and isinstance(message_id, int):
-            keys.append(f"{channel_username}:{message_id}")
+            keys.add(f"{channel_username}:{message_id}")
 
     return keys
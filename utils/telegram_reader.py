@@ -1,16 +1,18 @@
-from telethon import TelegramClient
 from telethon.tl.types import MessageMediaPhoto, MessageMediaDocument
 
+# Document mime types treated as video (e.g. "video/mp4", "video/quicktime")
+_VIDEO_MIME_PREFIXES = ("video/",)
+
 
 def extract_channel_username(url: str) -> str:
     """
     Convert full t.me link to @username format.
     Example: https://t.me/MyChannel -> @MyChannel
     """
-    return '@' + url.strip().rstrip('/').split('/')[-1]
+    return '@' + url.strip().rstrip('/').rpartition('/')[2]
 
 
-async def fetch_latest_messages(api_id, api_hash, channel_username, limit: int = 1):
+async def fetch_latest_messages(client, channel_username, limit: int = 1, min_id: int = 0):
     """
     Fetch latest messages from a Telegram channel.
 
@@ -30,13 +32,16 @@ async def fetch_latest_messages(api_id, api_hash, channel_username, limit: int =
     - 'raw' is kept so main script can call client.download_media(raw, file=...)
     - 'media_group_id' lets you group multiple photos/videos into one batch
       (same concept as your FB script).
+    - 'client' is an already-started TelegramClient owned by the caller,
+      so one connection is reused across every channel.
+    - 'min_id' (exclusive) makes Telegram skip messages we've already seen,
+      e.g. the highest message ID already posted from this channel.
     """
-    client = TelegramClient("telegram_session", api_id, api_hash)
-    await client.start()
-
     messages = []
 
-    async for message in client.iter_messages(channel_username, limit=limit):
+    async for message in client.iter_messages(
+        channel_username, limit=limit, min_id=min_id
+    ):
         text = message.text or ""
 
         has_photo = isinstance(message.media, MessageMediaPhoto)
@@ -46,7 +51,7 @@ async def fetch_latest_messages(api_id, api_hash, channel_username, limit: int =
         # Detect video (document with video/* mime_type)
         if isinstance(message.media, MessageMediaDocument):
             mime = getattr(message.file, "mime_type", "") or ""
-            if mime.startswith("video/") or "video" in mime:
+            if mime.startswith(_VIDEO_MIME_PREFIXES):
                 has_video = True
                 video_media = message.media
 
@@ -66,5 +71,4 @@ async def fetch_latest_messages(api_id, api_hash, channel_username, limit: int =
                 }
             )
 
-    await client.disconnect()
     return messages
@@ -1,21 +1,166 @@
 import os
+import io
 import re
+import sys
 import html
 import json
-import requests
+import asyncio
+import hashlib
+import functools
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+import contextlib
+from typing import BinaryIO
+import httpx
+import orjson
 import google.generativeai as genai
 
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
 TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
 
+# -------------------- Logging --------------------
+
+# Status lines are written straight to stdout (no buffering), so they stay
+# in order with the print() output of main.py / ai_translator.py in the CI log.
+# Messages use lazy %-formatting.
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+logger.propagate = False
+
+_stdout_handler = logging.StreamHandler(sys.stdout)
+_stdout_handler.setFormatter(logging.Formatter("%(message)s"))
+logger.addHandler(_stdout_handler)
+
 API_BASE = "https://api.telegram.org"
 MESSAGE_LIMIT = 4096
 CAPTION_LIMIT = 1024  # official caption limit
+PHOTO_MAX_BYTES = 10 * 1024 * 1024  # sendPhoto upload limit
+PHOTO_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp"}
 
 # We'll keep some margin so type tag + HTML don't push us over hard limit
 TEXT_SPLIT_LIMIT = MESSAGE_LIMIT - 200     # safe budget for text chunks
 CAPTION_SPLIT_LIMIT = CAPTION_LIMIT - 50   # safe budget for caption chunk
 
+
+def _tg_len(s: str) -> int:
+    """
+    Length the way Telegram counts it: UTF-16 code units, so an emoji or any
+    other non-BMP character counts as 2 while len() counts it as 1.
+    """
+    return len(s.encode("utf-16-le")) // 2
+
+
+def _tg_truncate(s: str, limit: int) -> str:
+    """
+    Cut 's' to at most 'limit' UTF-16 code units, never inside a surrogate pair.
+    """
+    if len(s) <= limit // 2:
+        return s
+    data = s.encode("utf-16-le")
+    if len(data) <= limit * 2:
+        return s
+    return data[: limit * 2].decode("utf-16-le", errors="ignore")
+
+
+# -------------------- Bot config --------------------
+
+@dataclass(frozen=True, slots=True, repr=False)  # no repr: URLs embed the token
+class _Cfg:
+    """
+    Bot API settings resolved once at import, so every send reuses the same
+    chat_id and endpoint URLs instead of re-checking env vars / f-strings.
+    """
+    chat_id: str
+    send_message_url: str
+    send_photo_url: str
+    send_video_url: str
+
+
+def _load_cfg() -> _Cfg | None:
+    """
+    None when TELEGRAM_BOT_TOKEN / TELEGRAM_CHAT_ID are missing;
+    the send functions then log and return without posting.
+    """
+    if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
+        return None
+
+    bot_url = f"{API_BASE}/bot{TELEGRAM_BOT_TOKEN}"
+    return _Cfg(
+        chat_id=TELEGRAM_CHAT_ID,
+        send_message_url=f"{bot_url}/sendMessage",
+        send_photo_url=f"{bot_url}/sendPhoto",
+        send_video_url=f"{bot_url}/sendVideo",
+    )
+
+
+_CFG = _load_cfg()
+
+# -------------------- HTTP client --------------------
+
+# One async keep-alive client for every Bot API call in this run, so sends
+# don't block the event loop and split messages / photo + tail chunks reuse
+# the same connection. HTTP/2 (needs httpx[http2]) keeps that one connection
+# usable for every request with no per-request handshake; connect timeout is
+# short so a dead network fails fast. Close it with close_http_client().
+_CLIENT = httpx.AsyncClient(
+    http2=True,
+    headers={"User-Agent": "mudahprompt/1.0"},
+    timeout=httpx.Timeout(20.0, connect=5.0),
+    limits=httpx.Limits(max_keepalive_connections=5),
+)
+
+# sendMessage bodies are serialized with orjson (straight to UTF-8 bytes)
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Uploads get longer read/write time, same short connect timeout
+PHOTO_TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+VIDEO_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Only 429 is retried: Telegram rejects a rate-limited request without
+# posting it. A 5xx may come back after the post was already accepted, and
+# send* calls aren't idempotent, so retrying those risks duplicate posts.
+RETRY_STATUSES = {429}
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+
+
+def _retry_after(r: httpx.Response) -> float | None:
+    """
+    Seconds Telegram asked us to wait (Retry-After header or
+    parameters.retry_after in the JSON body), if any.
+    """
+    value = r.headers.get("Retry-After")
+    if value is None:
+        try:
+            value = r.json().get("parameters", {}).get("retry_after")
+        except ValueError:
+            value = None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+async def _post(url: str, **kwargs) -> httpx.Response:
+    """
+    POST through the shared client.
+    Backs off and retries on 429 (honouring retry_after).
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        r = await _CLIENT.post(url, **kwargs)
+        if r.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            return r
+
+        delay = _retry_after(r) or RETRY_BACKOFF * (2 ** attempt)
+        logger.warning("⏳ Telegram HTTP %d, retrying in %.1fs...", r.status_code, delay)
+        await asyncio.sleep(delay)
+
+
+async def close_http_client():
+    await _CLIENT.aclose()
+
 # -------------------- Gemini config --------------------
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
@@ -24,7 +169,7 @@ GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL_NAME", "gemini-2.0-flash")
 if GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
 else:
-    print("⚠️ GEMINI_API_KEY not set. Splitter will fall back to local heuristic only.")
+    logger.warning("⚠️ GEMINI_API_KEY not set. Splitter will fall back to local heuristic only.")
 
 
 def _call_gemini(prompt: str) -> str | None:
@@ -46,16 +191,21 @@ def _call_gemini(prompt: str) -> str | None:
             return txt.strip()
         return None
     except Exception as e:
-        print(f"❌ Gemini call error in telegram_sender: {e}")
+        logger.error("❌ Gemini call error in telegram_sender: %s", e)
         return None
 
 
 # -------------------- Markdown → HTML (safe subset) --------------------
 
-MD_LINK_RE = re.compile(r'\[([^\]]+)\]\((https?://[^)\s]+)\)')
-MD_BOLD_RE = re.compile(r'(\*\*|__)(.+?)\1', re.DOTALL)
-MD_ITALIC_RE = re.compile(
-    r'(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)|(?<!_)_(?!_)(.+?)(?<!_)_(?!_)',
+# Italic spans use possessive [^*\n]++ / [^_\n]++ (Python 3.11+), so an
+# unclosed '*' or '_' only scans to the end of its line and never backtracks.
+# No outer group: m.lastindex (last group closed) tells which alternative
+# matched - 2 = link, 4 = bold, 5 = *italic*, 6 = _italic_.
+_TOKEN_RE = re.compile(
+    r'\[([^\]]+)\]\((https?://[^)\s]+)\)|'            # [label](url)
+    r'(\*\*|__)(.+?)\3|'                              # **bold** or __bold__
+    r'(?<!\*)\*([^*\n]++)\*(?!\*)|'                   # *italic* (single line)
+    r'(?<!_)_([^_\n]++)_(?!_)',                       # _italic_ (single line)
     re.DOTALL
 )
 
@@ -65,55 +215,60 @@ def render_html_with_basic_md(text: str) -> str:
     Convert a minimal Markdown subset to Telegram-safe HTML:
       - [label](url)  -> <a href="url">label</a>
       - **bold**/__bold__ -> <b>bold</b>
-      - *italic*/_italic_  -> <i>italic</i>
+      - *italic*/_italic_  -> <i>italic</i> (within a single line)
     Everything else is HTML-escaped. Labels/hrefs are escaped too.
     """
     if not text:
         return ""
 
-    token_re = re.compile(
-        r'(\[([^\]]+)\]\((https?://[^)\s]+)\)|'          # [label](url)
-        r'(\*\*|__)(.+?)\4|'                             # **bold** or __bold__
-        r'(?<!\*)\*(?!\*)(.+?)(?<!\*)\*(?!\*)|'          # *italic*
-        r'(?<!_)_(?!_)(.+?)(?<!_)_(?!_))',               # _italic_
-        re.DOTALL
-    )
+    # Fast path: no Markdown markers at all -> plain escape, skip the regex
+    if "*" not in text and "_" not in text and "[" not in text:
+        return html.escape(text)
+
+    # Escape the whole text in one pass, then tokenize the escaped string.
+    # Markdown delimiters and URL chars are untouched by html.escape, so the
+    # matches are the same, and each captured group is already HTML-safe.
+    escaped = html.escape(text)
 
     out = []
+    append = out.append  # bound once, not looked up per token
     i = 0
-    for m in token_re.finditer(text):
-        out.append(html.escape(text[i:m.start()]))
-
-        full = m.group(1)
-        link_label = m.group(2)
-        link_href = m.group(3)
-        bold_delim = m.group(4)
-        bold_inner = m.group(5)
-        italic_star_inner = m.group(6)
-        italic_underscore_inner = m.group(7)
-
-        if link_label and link_href:
-            out.append(
-                f'<a href="{html.escape(link_href, quote=True)}">'
-                f'{html.escape(link_label)}</a>'
-            )
-        elif bold_delim and bold_inner is not None:
-            out.append(f'<b>{html.escape(bold_inner)}</b>')
-        elif italic_star_inner is not None:
-            out.append(f'<i>{html.escape(italic_star_inner)}</i>')
-        elif italic_underscore_inner is not None:
-            out.append(f'<i>{html.escape(italic_underscore_inner)}</i>')
+    for m in _TOKEN_RE.finditer(escaped):
+        append(escaped[i:m.start()])
+
+        # Branch on the matched alternative instead of unpacking every group
+        last = m.lastindex
+        if last == 2:
+            append(f'<a href="{m[2]}">{m[1]}</a>')
+        elif last == 4:
+            append(f'<b>{m[4]}</b>')
         else:
-            out.append(html.escape(full))
+            append(f'<i>{m[last]}</i>')
 
         i = m.end()
 
-    out.append(html.escape(text[i:]))
+    append(escaped[i:])
     return "".join(out)
 
 
+@functools.lru_cache(maxsize=64)
+def _type_tag_html(post_type: str | None) -> str:
+    """
+    Pre-rendered '[<b>Type</b>]' header line, escaped once per post_type.
+    Prepended to already-rendered HTML so the <b> tag is never escaped.
+    """
+    if not post_type:
+        return ""
+    return f"[<b>{html.escape(post_type)}</b>]\n\n"
+
+
 # -------------------- Local heuristic splitter (fallback) --------------------
 
+# A local split counts as "clean" when every cut is at a newline or sentence
+# end at least this far into its window; Gemini is skipped for those.
+CLEAN_SPLIT_RATIO = 0.85
+
+
 def _split_for_telegram_raw(text: str, limit: int) -> list[str]:
     """
     Pure local splitter (no Gemini).
@@ -123,62 +278,97 @@ def _split_for_telegram_raw(text: str, limit: int) -> list[str]:
       3. Sentence end (. / ! / ? + space)
       4. Space
       5. Hard cut at 'limit'
+    Searches run on offsets into the original text, so only the emitted
+    chunks get sliced out (no copy of the remaining tail per chunk).
+    """
+    return _split_local(text, limit)[0]
+
+
+def _split_local(text: str, limit: int) -> tuple[list[str], bool]:
+    """
+    _split_for_telegram_raw() plus a flag saying whether the split is clean
+    (see CLEAN_SPLIT_RATIO), i.e. as good as Gemini would pick.
     """
     if text is None:
-        return [""]
+        return [""], True
     text = text or ""
-    if len(text) <= limit:
-        return [text]
+    n = len(text)
+    if n <= limit and _tg_len(text) <= limit:
+        return [text], True
 
     parts = []
-    remaining = text
-
-    while remaining:
-        if len(remaining) <= limit:
-            parts.append(remaining)
+    start = 0
+    clean = True
+
+    while start < n:
+        # 'limit' is in UTF-16 code units: pull the window end back by the
+        # overshoot (each char is >= 1 unit, so one step is always enough)
+        end = min(start + limit, n)
+        over = _tg_len(text[start:end]) - limit
+        if over > 0:
+            end = max(end - over, start + 1)
+        elif end == n:
+            parts.append(text[start:])
             break
 
-        chunk = remaining[:limit]
+        # Only split points past 40% of the window are accepted, so every
+        # search starts there instead of scanning back to 'start' for nothing
+        floor = start + int(limit * 0.4) + 1
         split_idx = -1
 
         # 1. Try double newline
-        idx = chunk.rfind("\n\n")
-        if idx != -1 and idx > limit * 0.4:
+        idx = text.rfind("\n\n", floor, end)
+        if idx != -1:
             split_idx = idx + 2
 
         # 2. Try single newline
         if split_idx == -1:
-            idx = chunk.rfind("\n")
-            if idx != -1 and idx > limit * 0.4:
+            idx = text.rfind("\n", floor, end)
+            if idx != -1:
                 split_idx = idx + 1
 
         # 3. Try sentence end (. ! ? + space)
         if split_idx == -1:
-            for ender in [". ", "! ", "? "]:
-                idx = chunk.rfind(ender)
-                if idx != -1 and idx > limit * 0.4:
+            for ender in (". ", "! ", "? "):
+                idx = text.rfind(ender, floor, end)
+                if idx != -1:
                     split_idx = idx + len(ender)
                     break
 
+        if split_idx == -1 or split_idx - start < limit * CLEAN_SPLIT_RATIO:
+            clean = False
+
         # 4. Try last space
         if split_idx == -1:
-            idx = chunk.rfind(" ")
-            if idx != -1 and idx > limit * 0.4:
+            idx = text.rfind(" ", floor, end)
+            if idx != -1:
                 split_idx = idx + 1
 
         # 5. Fallback: hard cut
         if split_idx == -1:
-            split_idx = limit
+            split_idx = end
 
-        part = remaining[:split_idx].rstrip()
-        parts.append(part)
-        remaining = remaining[split_idx:].lstrip()
+        parts.append(text[start:split_idx].rstrip())
 
-    return [p[:limit] for p in parts]
+        # Skip leading whitespace of the next chunk (same as lstrip, no copy)
+        start = split_idx
+        while start < n and text[start].isspace():
+            start += 1
+
+    # Every part is text[start:split_idx] with split_idx <= end, and the
+    # window already fits 'limit', so no final truncation pass is needed
+    return parts, clean
 
 
 # -------------------- Gemini-powered splitter (no rewriting) --------------------
 
+# Successful Gemini splits keyed by (sha256 of text, limit), so a retried or
+# re-posted text doesn't pay another Gemini round trip. Failures aren't cached.
+SPLIT_CACHE_SIZE = 512
+_split_cache: "OrderedDict[tuple[str, int], tuple[str, ...]]" = OrderedDict()
+_split_cache_lock = threading.Lock()
+
+
 def _split_with_gemini(text: str, limit: int) -> list[str] | None:
     """
     Ask Gemini to split the text into chunks WITHOUT changing any words.
@@ -195,9 +385,29 @@ def _split_with_gemini(text: str, limit: int) -> list[str] | None:
         return None
 
     text = text or ""
-    if len(text) <= limit:
+    if _tg_len(text) <= limit:
         return [text]
 
+    key = (hashlib.sha256(text.encode("utf-8")).hexdigest(), limit)
+    with _split_cache_lock:
+        cached = _split_cache.get(key)
+        if cached is not None:
+            _split_cache.move_to_end(key)
+            return list(cached)
+
+    chunks = _ask_gemini_to_split(text, limit)
+    if chunks is not None:
+        with _split_cache_lock:
+            _split_cache[key] = tuple(chunks)
+            if len(_split_cache) > SPLIT_CACHE_SIZE:
+                _split_cache.popitem(last=False)
+    return chunks
+
+
+def _ask_gemini_to_split(text: str, limit: int) -> list[str] | None:
+    """
+    Uncached Gemini call behind _split_with_gemini().
+    """
     prompt = f"""
 You are helping split a Telegram message.
 
@@ -231,52 +441,109 @@ Text to split:
     try:
         chunks = json.loads(raw)
         if not isinstance(chunks, list) or not all(isinstance(c, str) for c in chunks):
-            print("❌ Gemini splitter: response is not a list of strings, falling back.")
+            logger.error("❌ Gemini splitter: response is not a list of strings, falling back.")
             return None
 
         # Check concatenation matches original (no words changed)
         joined = "".join(chunks)
         if joined != text:
-            print("❌ Gemini splitter: concatenated chunks != original text, falling back.")
+            logger.error("❌ Gemini splitter: concatenated chunks != original text, falling back.")
             return None
 
         # Check each segment length
         for c in chunks:
-            if len(c) > limit:
-                print("❌ Gemini splitter: a chunk exceeds limit, falling back.")
+            if _tg_len(c) > limit:
+                logger.error("❌ Gemini splitter: a chunk exceeds limit, falling back.")
                 return None
 
         return chunks
 
     except json.JSONDecodeError:
-        print("❌ Gemini splitter: invalid JSON, falling back.")
+        logger.error("❌ Gemini splitter: invalid JSON, falling back.")
         return None
     except Exception as e:
-        print(f"❌ Gemini splitter: unexpected error {e}, falling back.")
+        logger.error("❌ Gemini splitter: unexpected error %s, falling back.", e)
         return None
 
 
 def split_text_with_gemini_or_fallback(text: str, limit: int) -> list[str]:
     """
     Main splitter used by sender:
-      - First try Gemini-based splitting (no rewriting).
+      - If the local splitter already cuts cleanly (newlines / sentence ends
+        near the end of each window), use it and skip the Gemini round trip.
+      - Otherwise try Gemini-based splitting (no rewriting).
       - If anything fails, use local heuristic splitter.
     """
     text = text or ""
-    if len(text) <= limit:
+    if _tg_len(text) <= limit:
         return [text]
 
+    local_chunks, clean = _split_local(text, limit)
+    if clean:
+        return local_chunks
+
     chunks = _split_with_gemini(text, limit)
     if chunks is not None:
         return chunks
 
     # Fallback if Gemini fails / missing
-    return _split_for_telegram_raw(text, limit)
+    return local_chunks
+
+
+# -------------------- Media helpers --------------------
+
+def _open_media(media: str | BinaryIO):
+    """
+    Accept either a file path or an in-memory file-like object
+    (e.g. io.BytesIO filled by client.download_media(raw, file=buf)).
+    Paths are opened here; file-like objects are rewound and used as-is.
+    """
+    if isinstance(media, (str, os.PathLike)):
+        return open(media, "rb")
+    media.seek(0)
+    return contextlib.nullcontext(media)
+
+
+def _media_filename(media_file, default: str) -> str:
+    if isinstance(media_file, (str, os.PathLike)):
+        return os.path.basename(media_file) or default
+    return os.path.basename(getattr(media_file, "name", "") or default)
+
+
+def _media_size(media: str | BinaryIO) -> int:
+    """
+    Size in bytes without reading the content:
+    os.stat for paths, the buffer length for io.BytesIO, else seek to end.
+    """
+    if isinstance(media, (str, os.PathLike)):
+        return os.stat(media).st_size
+    if hasattr(media, "getbuffer"):
+        return media.getbuffer().nbytes
+    return media.seek(0, os.SEEK_END)
+
+
+def _read_media_file(path) -> io.BytesIO:
+    with open(path, "rb") as f:
+        buf = io.BytesIO(f.read())
+    buf.name = os.path.basename(path)
+    return buf
+
+
+async def _load_media(media: str | BinaryIO) -> BinaryIO:
+    """
+    Paths are read into memory in a worker thread (so the read can overlap
+    the caption split); file-like objects are returned as-is.
+    Only used for photos, which are capped at PHOTO_MAX_BYTES - videos keep
+    streaming from disk through _open_media().
+    """
+    if isinstance(media, (str, os.PathLike)):
+        return await asyncio.to_thread(_read_media_file, media)
+    return media
 
 
 # -------------------- Public send functions --------------------
 
-def send_telegram_message_html(
+async def send_telegram_message_html(
     translated_text: str,
     exchange_name: str | None = None,
     referral_link: str | None = None,
@@ -291,53 +558,61 @@ def send_telegram_message_html(
       - Falls back to a local splitter if Gemini fails or is missing.
       - Adds [<b>Type</b>] on its own line at the top of the FIRST chunk only.
     """
-    if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
-        print("❌ TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID not set in environment.")
+    cfg = _CFG
+    if cfg is None:
+        logger.error("❌ TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID not set in environment.")
         return []
 
-    raw_chunks = split_text_with_gemini_or_fallback(
+    # Gemini splitter is a blocking call, keep it off the event loop
+    raw_chunks = await asyncio.to_thread(
+        split_text_with_gemini_or_fallback,
         translated_text or "",
         TEXT_SPLIT_LIMIT,
     )
-    url = f"{API_BASE}/bot{TELEGRAM_BOT_TOKEN}/sendMessage"
-
-    results = []
+    url = cfg.send_message_url
 
+    # Render + serialize every chunk up front so the send loop below is only
+    # network round trips. Sends stay one-by-one on the shared keep-alive client:
+    # concurrent sends to the same chat can land out of order in the channel.
+    payloads = []
     for i, raw_chunk in enumerate(raw_chunks, 1):
         safe_html = render_html_with_basic_md(raw_chunk)
 
         # Insert type tag AFTER conversion so <b> isn't escaped
-        if post_type and i == 1:
-            type_tag = f"[<b>{html.escape(post_type)}</b>]\n\n"
-            safe_html = type_tag + safe_html
+        if i == 1:
+            safe_html = _type_tag_html(post_type) + safe_html
 
-        payload = {
-            "chat_id": TELEGRAM_CHAT_ID,
+        payloads.append(orjson.dumps({
+            "chat_id": cfg.chat_id,
             "text": safe_html,
             "parse_mode": "HTML",
             "disable_web_page_preview": False,
-        }
+        }))
+
+    results = []
 
+    for i, (raw_chunk, payload) in enumerate(zip(raw_chunks, payloads), 1):
         try:
-            r = requests.post(url, json=payload, timeout=20)
-            results.append(r.json())
-            if r.ok and r.json().get("ok"):
-                print(
-                    f"✅ Telegram message part {i}/{len(raw_chunks)} sent "
-                    f"(raw-len={len(raw_chunk)})."
+            r = await _post(url, content=payload, headers=_JSON_HEADERS)
+            body = r.json()
+            results.append(body)
+            if r.is_success and body.get("ok"):
+                logger.info(
+                    "✅ Telegram message part %d/%d sent (raw-len=%d).",
+                    i, len(raw_chunks), len(raw_chunk),
                 )
             else:
-                print(
-                    f"❌ Telegram send error part {i}/{len(raw_chunks)}: {r.text}"
+                logger.error(
+                    "❌ Telegram send error part %d/%d: %s", i, len(raw_chunks), r.text
                 )
         except Exception as e:
-            print(f"❌ Telegram send exception part {i}/{len(raw_chunks)}: {e}")
+            logger.error("❌ Telegram send exception part %d/%d: %s", i, len(raw_chunks), e)
 
     return results
 
 
-def send_photo_to_telegram_channel(
-    image_path: str,
+async def send_photo_to_telegram_channel(
+    image_path: str | BinaryIO,
     translated_caption: str,
     exchange_name: str | None = None,
     referral_link: str | None = None,
@@ -345,6 +620,7 @@ def send_photo_to_telegram_channel(
 ):
     """
     Sends a photo with caption.
+    'image_path' can be a file path or a file-like object (e.g. io.BytesIO).
 
     Behaviour:
       - Uses Gemini splitter (no rewriting) to get caption chunks within CAPTION_SPLIT_LIMIT.
@@ -352,52 +628,82 @@ def send_photo_to_telegram_channel(
       - Remaining chunks (if any) are sent as follow-up text messages (without repeating [Type]).
       - [<b>Type</b>] goes on its own line at the top of the caption only.
     """
-    if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
-        print("❌ TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID not set in environment.")
+    cfg = _CFG
+    if cfg is None:
+        logger.error("❌ TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID not set in environment.")
+        return None
+
+    # Don't upload (or split the caption for) a photo Telegram will reject
+    try:
+        photo_size = _media_size(image_path)
+    except FileNotFoundError:
+        logger.error("❌ Image not found: %s", image_path)
+        return None
+    except OSError as e:
+        logger.error("❌ Cannot read image %s: %s", image_path, e)
+        return None
+
+    photo_ext = os.path.splitext(_media_filename(image_path, "photo.jpg"))[1].lower()
+    if photo_size == 0 or photo_size > PHOTO_MAX_BYTES or photo_ext not in PHOTO_EXTENSIONS:
+        logger.error(
+            "❌ Photo not sendable (size=%d bytes, type=%s), skipping.",
+            photo_size, photo_ext or "?",
+        )
         return None
 
     caption_text = translated_caption or ""
 
-    # Split caption into chunks using Gemini or fallback
-    caption_chunks = split_text_with_gemini_or_fallback(
-        caption_text,
-        CAPTION_SPLIT_LIMIT,
-    )
+    # Split caption into chunks using Gemini or fallback, while the photo
+    # is read from disk (if it's a path) at the same time
+    try:
+        caption_chunks, photo = await asyncio.gather(
+            asyncio.to_thread(
+                split_text_with_gemini_or_fallback,
+                caption_text,
+                CAPTION_SPLIT_LIMIT,
+            ),
+            _load_media(image_path),
+        )
+    except FileNotFoundError:
+        logger.error("❌ Image not found: %s", image_path)
+        return None
+    except OSError as e:
+        logger.error("❌ Cannot read image %s: %s", image_path, e)
+        return None
 
     head_raw = caption_chunks[0]
     tail_chunks = caption_chunks[1:] if len(caption_chunks) > 1 else []
 
-    # Extra safety: enforce hard caption limit
-    if len(head_raw) > CAPTION_LIMIT:
-        head_raw = head_raw[:CAPTION_LIMIT]
+    # Extra safety: enforce hard caption limit (in UTF-16 units, like Telegram)
+    head_raw = _tg_truncate(head_raw, CAPTION_LIMIT)
 
     caption_head_html = render_html_with_basic_md(head_raw)
 
     # Insert type tag only once, at top of the caption
-    if post_type:
-        type_tag = f"[<b>{html.escape(post_type)}</b>]\n\n"
-        caption_head_html = type_tag + caption_head_html
+    caption_head_html = _type_tag_html(post_type) + caption_head_html
 
-    url = f"{API_BASE}/bot{TELEGRAM_BOT_TOKEN}/sendPhoto"
+    url = cfg.send_photo_url
 
     try:
-        with open(image_path, "rb") as photo_file:
-            files = {"photo": photo_file}
+        with _open_media(photo) as photo_file:
+            files = {
+                "photo": (_media_filename(photo_file, "photo.jpg"), photo_file, "image/jpeg")
+            }
             data = {
-                "chat_id": TELEGRAM_CHAT_ID,
+                "chat_id": cfg.chat_id,
                 "caption": caption_head_html,
                 "parse_mode": "HTML",
             }
-            r = requests.post(url, data=data, files=files, timeout=30)
+            r = await _post(url, data=data, files=files, timeout=PHOTO_TIMEOUT)
 
-        if r.ok and r.json().get("ok"):
-            print(f"✅ Photo sent. Caption raw-len={len(head_raw)}.")
+        if r.is_success and r.json().get("ok"):
+            logger.info("✅ Photo sent. Caption raw-len=%d.", len(head_raw))
         else:
-            print(f"❌ Failed to send photo: {r.text}")
+            logger.error("❌ Failed to send photo: %s", r.text)
 
         # Send any remaining caption chunks as normal messages (no type repeated)
         for chunk in tail_chunks:
-            send_telegram_message_html(
+            await send_telegram_message_html(
                 translated_text=chunk,
                 exchange_name=exchange_name,
                 referral_link=referral_link,
@@ -405,16 +711,14 @@ def send_photo_to_telegram_channel(
             )
 
         return r.json()
-    except FileNotFoundError:
-        print(f"❌ Image not found: {image_path}")
     except Exception as e:
-        print(f"❌ Telegram photo send exception: {e}")
+        logger.error("❌ Telegram photo send exception: %s", e)
 
     return None
 
 
-def send_video_to_telegram_channel(
-    video_path: str,
+async def send_video_to_telegram_channel(
+    video_path: str | BinaryIO,
     translated_caption: str,
     exchange_name: str | None = None,
     referral_link: str | None = None,
@@ -422,6 +726,7 @@ def send_video_to_telegram_channel(
 ):
     """
     Sends a video with caption.
+    'video_path' can be a file path or a file-like object (e.g. io.BytesIO).
 
     Behaviour:
       - Same style as send_photo_to_telegram_channel:
@@ -430,18 +735,16 @@ def send_video_to_telegram_channel(
         * Remaining chunks as follow-up text messages.
         * [<b>Type</b>] only once at the top of the caption.
     """
-    if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHAT_ID:
-        print("❌ TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID not set in environment.")
-        return None
-
-    if not os.path.exists(video_path):
-        print(f"❌ Video not found: {video_path}")
+    cfg = _CFG
+    if cfg is None:
+        logger.error("❌ TELEGRAM_BOT_TOKEN or TELEGRAM_CHAT_ID not set in environment.")
         return None
 
     caption_text = translated_caption or ""
 
     # Split caption into chunks
-    caption_chunks = split_text_with_gemini_or_fallback(
+    caption_chunks = await asyncio.to_thread(
+        split_text_with_gemini_or_fallback,
         caption_text,
         CAPTION_SPLIT_LIMIT,
     )
@@ -449,37 +752,36 @@ def send_video_to_telegram_channel(
     head_raw = caption_chunks[0]
     tail_chunks = caption_chunks[1:] if len(caption_chunks) > 1 else []
 
-    # Enforce official caption limit
-    if len(head_raw) > CAPTION_LIMIT:
-        head_raw = head_raw[:CAPTION_LIMIT]
+    # Enforce official caption limit (in UTF-16 units, like Telegram)
+    head_raw = _tg_truncate(head_raw, CAPTION_LIMIT)
 
     caption_head_html = render_html_with_basic_md(head_raw)
 
     # Add type tag once
-    if post_type:
-        type_tag = f"[<b>{html.escape(post_type)}</b>]\n\n"
-        caption_head_html = type_tag + caption_head_html
+    caption_head_html = _type_tag_html(post_type) + caption_head_html
 
-    url = f"{API_BASE}/bot{TELEGRAM_BOT_TOKEN}/sendVideo"
+    url = cfg.send_video_url
 
     try:
-        with open(video_path, "rb") as video_file:
-            files = {"video": video_file}
+        with _open_media(video_path) as video_file:
+            files = {
+                "video": (_media_filename(video_file, "video.mp4"), video_file, "video/mp4")
+            }
             data = {
-                "chat_id": TELEGRAM_CHAT_ID,
+                "chat_id": cfg.chat_id,
                 "caption": caption_head_html,
                 "parse_mode": "HTML",
             }
-            r = requests.post(url, data=data, files=files, timeout=60)
+            r = await _post(url, data=data, files=files, timeout=VIDEO_TIMEOUT)
 
-        if r.ok and r.json().get("ok"):
-            print(f"✅ Video sent. Caption raw-len={len(head_raw)}.")
+        if r.is_success and r.json().get("ok"):
+            logger.info("✅ Video sent. Caption raw-len=%d.", len(head_raw))
         else:
-            print(f"❌ Failed to send video: {r.text}")
+            logger.error("❌ Failed to send video: %s", r.text)
 
         # Remainder caption as separate text messages
         for chunk in tail_chunks:
-            send_telegram_message_html(
+            await send_telegram_message_html(
                 translated_text=chunk,
                 exchange_name=exchange_name,
                 referral_link=referral_link,
@@ -487,7 +789,9 @@ def send_video_to_telegram_channel(
             )
 
         return r.json()
+    except FileNotFoundError:
+        logger.error("❌ Video not found: %s", video_path)
     except Exception as e:
-        print(f"❌ Telegram video send exception: {e}")
+        logger.error("❌ Telegram video send exception: %s", e)
 
     return None